@@ -0,0 +1,6 @@
+from .io import (read_gene_sets, convert_gene_sets_to_parquet, read_setlist,
+                 read_regenie_annotation, combine_annotations, combine_setlists,
+                 double_occurances, write_output)
+from .analyze import analyze_data
+from .run import (get_chromosomes, convert_annotation, convert_setlist,
+                  dedup_setlist, convert_annot, convert_data)
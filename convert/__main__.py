@@ -0,0 +1,27 @@
+import argparse
+
+from .analyze import analyze_data
+from .run import convert_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="REGENIE gene set conversion tools.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('analyze', help="Report overlaps between gene sets and REGENIE files.")
+
+    convert_parser = subparsers.add_parser('convert', help="Convert REGENIE files to gene set files.")
+    convert_parser.add_argument('--out-dir', default='data/PTV_genesets',
+                                help="Directory for the converted files.")
+    convert_parser.add_argument('--format', choices=['tsv', 'parquet'], default='tsv',
+                                help="Output format for the converted files.")
+
+    args = parser.parse_args()
+    if args.command == 'analyze':
+        analyze_data()
+    else:
+        convert_data(out_dir=args.out_dir, format=args.format)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import pandas as pd
+
+from .io import (read_gene_sets, read_setlist, read_regenie_annotation,
+                 combine_annotations, combine_setlists, double_occurances)
+
+
+def analyze_data():
+    annot_filepath = 'data/PTV_test/PTV_test.chr1.REGENIE.annotationFile.txt'
+    geneset_df = read_gene_sets('data/burden_test_modules.obj')
+    regenie_setlist = read_setlist('data/PTV_test/PTV_test.chr1.REGENIE.setListFile.txt')
+    annot_df = read_regenie_annotation(annot_filepath)
+    combined_annot_df = combine_annotations('data/PTV_test')
+    double_occurances(combined_annot_df)
+    combined_setlist_df = combine_setlists('data/PTV_test')
+    double_occurances(combined_setlist_df, col='transcript')
+
+    # transcript to gene mapping
+    transcript_to_gene = pd.read_csv('data/transcript_gene_map.csv')
+    transcript_to_gene.columns = ['chr','transcript', 'gene', 'gene_symbol']
+
+    # compare transcript to gene mapping with the geneset_df
+    # (agg on object: list-valued results can't be cast back to the
+    # categorical gene_set dtype)
+    gs = geneset_df.assign(gene_set=geneset_df['gene_set'].astype(object)).groupby("gene")
+    # to df
+    gs = gs.agg(list).reset_index()
+    merged_transcript_df = transcript_to_gene.merge(gs, on='gene', how='inner')
+    print(f"Found {merged_transcript_df.gene.nunique()} matching genes between transcript and gene set.")
+    # print how many not found, via set difference: one hash-set build per
+    # frame instead of isin masks plus nunique rehashes
+    gs_genes = set(gs['gene'].unique())
+    tx_genes = set(transcript_to_gene['gene'].unique())
+    print(f"Found {len(gs_genes - tx_genes)} genes in the gene set that are not in the transcript to gene mapping.")
+    # not found the other way around
+    print(f"Found {len(tx_genes - gs_genes)} genes in the transcript to gene mapping that are not in the gene set.")
+
+    # are there duplicates in the merged_transcript_df?
+    duplicates = merged_transcript_df[merged_transcript_df.duplicated(subset=['transcript'], keep=False)]
+    if not duplicates.empty:
+        print(f"Warning: Found {duplicates.transcript.nunique()} transcripts that appear more than once in the merged transcript to gene mapping.")
+    else:
+        print("No duplicates found in the merged transcript to gene mapping.")
+
+
+    # map the setlist to the transcript to gene mapping
+    combined_setlist_df = combined_setlist_df.merge(merged_transcript_df, on='transcript', how='left')
+    # report if there are any transcripts in the setlist that are not in the transcript to gene mapping
+    missing_transcripts = combined_setlist_df[combined_setlist_df['gene'].isna()]
+    if not missing_transcripts.empty:
+        print(f"Warning: {missing_transcripts.transcript.nunique()} transcripts in the setlist are not present in the transcript to gene mapping.")
+    else:
+        print("All transcripts in the setlist are present in the transcript to gene mapping.")
+
+    print(combined_setlist_df.head())
+
+    # same for annot_df
+    combined_annot_df = combined_annot_df.merge(merged_transcript_df, on='transcript', how='left')
+    # report if there are any transcripts in the annotation that are not in the transcript to gene mapping
+    missing_transcripts_annot = combined_annot_df[combined_annot_df['gene'].isna()]
+    if not missing_transcripts_annot.empty:
+        print(f"Warning: {missing_transcripts_annot.transcript.nunique()} transcripts in the annotation are not present in the transcript to gene mapping.")
+    else:
+        print("All transcripts in the annotation are present in the transcript to gene mapping.")
+
+    # save combined_annot_df to a file
+    #combined_annot_df.to_csv('data/PTV_all_snps.csv', index=False)
+    # save combined_setlist_df to a file
+    #combined_setlist_df.to_csv('data/PTV_all_transcripts.csv', index=False)
+    #converted_df = convert_annotation(annot_filepath, geneset_df)
+    #print(converted_df.head())
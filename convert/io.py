@@ -0,0 +1,184 @@
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv
+import pyarrow.dataset
+import pyarrow.parquet as pq
+import os
+import glob
+
+def read_gene_sets(file_path):
+    """
+    Reads gene sets from a file and returns a DataFrame.
+
+    Args:
+        file_path (str): Path to the gene sets file.
+
+    Returns:
+        pd.DataFrame: DataFrame containing gene sets.
+    """
+    # if ends with obj, read as pickle
+    if file_path.endswith('.obj'):
+        df = pd.read_pickle(file_path)
+    # if ends with parquet, read columnar (no per-object unpickling)
+    elif file_path.endswith('.parquet'):
+        df = pd.read_parquet(file_path, dtype_backend='pyarrow')
+    # if ends with csv, read as csv
+    elif file_path.endswith('.csv'):
+        df = pd.read_csv(file_path, engine='pyarrow')
+
+    # the gene set ids live in the index, pull them out if needed
+    if df.shape[1] == 1:
+        df = df.reset_index()
+    df.columns = ['gene_set', 'gene']
+    # genes is list of genes, flatten it with repeat/concatenate, which
+    # allocates the output directly instead of explode's list walking
+    genes = df['gene']
+    if len(genes) and isinstance(genes.iloc[0], (list, np.ndarray)):
+        lengths = np.fromiter((len(g) for g in genes), dtype=np.int64, count=len(genes))
+        df = pd.DataFrame({
+            'gene_set': np.repeat(df['gene_set'].to_numpy(), lengths),
+            'gene': np.concatenate(genes.to_numpy()),
+        })
+    # categorical dtypes so merges hash int codes instead of strings
+    df['gene_set'] = df['gene_set'].astype('category')
+    df['gene'] = df['gene'].astype('category')
+    return df
+
+def convert_gene_sets_to_parquet(file_path):
+    """
+    One-time conversion of a pickled gene set file to parquet.
+
+    Args:
+        file_path (str): Path to the pickled gene sets file.
+
+    Returns:
+        str: Path to the written parquet file.
+    """
+    df = pd.read_pickle(file_path)
+    out_path = os.path.splitext(file_path)[0] + '.parquet'
+    pq.write_table(pa.Table.from_pandas(df), out_path)
+    return out_path
+
+def read_setlist(file_path):
+    """
+    Reads a gene set file in the regenie format and returns a DataFrame.
+
+    Args:
+        file_path (str): Path to the regenie gene set file.
+
+    Returns:
+        pd.DataFrame: DataFrame containing gene sets.
+    """
+    # pyarrow engine parses in parallel and releases the GIL
+    df = pd.read_csv(file_path, sep='\t', header=None,
+                     names=['transcript', 'chr', 'pos', 'snp'],
+                     engine='pyarrow', dtype_backend='pyarrow')
+    df['transcript'] = df['transcript'].astype('category')
+    # arrow-backed strings keep the snp lists in contiguous buffers
+    df['snp'] = df['snp'].astype('string[pyarrow]')
+
+    return df
+
+def read_regenie_annotation(file_path):
+    """
+    Reads an annotation file and returns a DataFrame.
+
+    Args:
+        file_path (str): Path to the annotation file.
+
+    Returns:
+        pd.DataFrame: DataFrame containing annotations.
+    """
+    # pyarrow engine parses in parallel and releases the GIL
+    df = pd.read_csv(file_path, sep='\t', header=None,
+                     names=['snp', 'transcript', 'snp_set'],
+                     engine='pyarrow', dtype_backend='pyarrow')
+    df['transcript'] = df['transcript'].astype('category')
+
+    return df
+
+def combine_annotations(directory):
+    """
+    Combines all annotation files in a directory into a single DataFrame.
+
+    Args:
+        directory (str): Path to the directory containing annotation files.
+
+    Returns:
+        pd.DataFrame: Combined DataFrame with all annotations.
+    """
+    all_files = sorted(glob.glob(os.path.join(directory, '*.REGENIE.annotationFile.txt')))
+    print(f"Reading {len(all_files)} annotation files from {directory}")
+
+    # one streaming multi-threaded dataset scan over all files, instead of
+    # 22 separate frames that pd.concat copies a second time
+    ds = pa.dataset.dataset(all_files, format=pa.dataset.CsvFileFormat(
+        parse_options=pa.csv.ParseOptions(delimiter='\t'),
+        read_options=pa.csv.ReadOptions(column_names=['snp', 'transcript', 'snp_set']),
+    ))
+    combined_df = ds.to_table().to_pandas(types_mapper=pd.ArrowDtype)
+    combined_df['transcript'] = combined_df['transcript'].astype('category')
+    return combined_df
+
+def combine_setlists(directory):
+    """
+    Combines all setlist files in a directory into a single DataFrame.
+
+    Args:
+        directory (str): Path to the directory containing setlist files.
+
+    Returns:
+        pd.DataFrame: Combined DataFrame with all setlists.
+    """
+    all_files = sorted(glob.glob(os.path.join(directory, '*.REGENIE.setListFile.txt')))
+    print(f"Reading {len(all_files)} setlist files from {directory}")
+
+    # one streaming multi-threaded dataset scan over all files, instead of
+    # 22 separate frames that pd.concat copies a second time
+    ds = pa.dataset.dataset(all_files, format=pa.dataset.CsvFileFormat(
+        parse_options=pa.csv.ParseOptions(delimiter='\t'),
+        read_options=pa.csv.ReadOptions(column_names=['transcript', 'chr', 'pos', 'snp']),
+    ))
+    combined_df = ds.to_table().to_pandas(types_mapper=pd.ArrowDtype)
+    combined_df['transcript'] = combined_df['transcript'].astype('category')
+    combined_df['snp'] = combined_df['snp'].astype('string[pyarrow]')
+    return combined_df
+
+def double_occurances(combined_df, col="snp"):
+    """
+    Reports values in a column that appear more than once.
+
+    Args:
+        combined_df (pd.DataFrame): Combined DataFrame to check.
+        col (str): Name of the column to check for duplicates.
+
+    Returns:
+        pd.Series: Counts per duplicated value (value -> occurrence count).
+    """
+    # one value_counts pass instead of duplicated() + nunique(), which
+    # hash the column twice and materialize a full boolean mask
+    counts = combined_df[col].value_counts()
+    dup_counts = counts[counts > 1]
+    print(f"Found {len(dup_counts)} {col}s that appear more than once across all files.")
+    return dup_counts
+
+def write_output(df, path, format='tsv'):
+    """
+    Writes an output DataFrame via pyarrow.
+
+    Args:
+        df (pd.DataFrame): DataFrame to write, columns already ordered.
+        path (str): Output path (extension is swapped for parquet).
+        format (str): 'tsv' for a header-less REGENIE-style TSV written by
+            the C++ CSV writer, 'parquet' for a zstd-compressed parquet file.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if format == 'parquet':
+        pq.write_table(table, os.path.splitext(path)[0] + '.parquet', compression='zstd')
+    else:
+        pa.csv.write_csv(
+            table, path,
+            write_options=pa.csv.WriteOptions(include_header=False, delimiter='\t',
+                                              quoting_style='none')
+        )
@@ -0,0 +1,260 @@
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from .io import read_gene_sets, read_setlist, read_regenie_annotation, write_output
+
+def get_chromosomes():
+    """
+    Returns a list of chromosomes.
+
+    Returns:
+        list: List of chromosome names.
+    """
+    return [f'chr{i}' for i in range(1, 23)] # + ['chrX', 'chrY']
+
+def convert_annotation(annot_filepath, geneset_df):
+    """
+    Converts an annotation file to a DataFrame with gene sets.
+
+    Args:
+        annot_filepath (str): Path to the annotation file.
+        geneset_df (pd.DataFrame): DataFrame containing gene sets.
+
+    Returns:
+        pd.DataFrame: DataFrame with gene sets and annotations.
+    """
+    annot_df = read_regenie_annotation(annot_filepath)
+    annot_df_merged = annot_df.merge(geneset_df, on='gene', how='left')
+
+    # report if there are any genes in the annotation that are not in the gene set
+    missing_genes = annot_df_merged[annot_df_merged['gene_set'].isna()]
+    if not missing_genes.empty:
+        print(f"Warning: {missing_genes.gene.nunique()} genes in the annotation file are not present in the gene set.")
+        print("These genes will be dropped from the final DataFrame.")
+
+    return annot_df_merged
+
+def convert_setlist(filename, transcript_map, outdir='data/converted_setlists', format='tsv'):
+    """
+    Converts a setlist file to a DataFrame with gene sets.
+
+    Args:
+        filename (str): Path to the setlist file.
+        transcript_map (pd.DataFrame): DataFrame containing transcript to gene mapping.
+
+    Returns:
+        pd.DataFrame: DataFrame with gene sets and transcripts.
+    """
+    setlist_df = read_setlist(filename)
+    # align category codes with the transcript map so the merge stays on int codes
+    if isinstance(transcript_map['transcript'].dtype, pd.CategoricalDtype):
+        setlist_df['transcript'] = setlist_df['transcript'].astype(transcript_map['transcript'].dtype)
+    # merge with transcript map
+    merged_df = setlist_df.merge(transcript_map, on='transcript', how='inner')
+    # assert no Nans in gene_set col
+    assert not merged_df['gene_set'].isna().any(), f"NaNs found in gene_set column for {filename}."
+
+    # check if we have duplicate gene entries
+    #duplicates = merged_df[merged_df.duplicated(subset=['transcript'], keep=False)]
+    #print(duplicates.head())
+    #if not duplicates.empty:
+    #    print(f"Warning: Found {duplicates.transcript.nunique()} transcripts that appear more than once in the setlist for {os.path.basename(filename)}.")
+    #    return
+
+    # split/dedup/re-join the snp lists in arrow: split_pattern, flatten with
+    # repeat-expanded keys, hash-aggregate distinct snps per gene set and
+    # comma-join element-wise, all in C instead of per-group Python sets
+    snp_lists = pc.split_pattern(pa.array(merged_df['snp'], type=pa.string()), pattern=',')
+    idx = pa.array(np.repeat(np.arange(len(merged_df)), pc.list_value_length(snp_lists).to_numpy()))
+    flat = pa.table({
+        'gene_set': pc.take(pa.array(merged_df['gene_set'].astype(str)), idx),
+        'chr': pc.take(pa.array(merged_df['chr']), idx),
+        'pos': pc.take(pa.array(merged_df['pos']), idx),
+        'snp': pc.list_flatten(snp_lists),
+    })
+    agg = flat.group_by(['gene_set', 'chr'], use_threads=False).aggregate([('snp', 'distinct'), ('pos', 'first')])
+    # hash aggregation emits groups in first-seen order; sort to keep the
+    # sorted-by-key row order the pandas groupby used to produce
+    agg = agg.sort_by([('gene_set', 'ascending'), ('chr', 'ascending')])
+    merged_df = pd.DataFrame({
+        'gene_set': agg.column('gene_set').to_pandas(),
+        'chr': agg.column('chr').to_pandas(),
+        'pos': agg.column('pos_first').to_pandas(),
+        'snp': pc.binary_join(agg.column('snp_distinct'), ',').to_pandas(),
+    })
+
+    # save to file in ['gene_set', 'chr', 'pos', 'snp'] order of columns, tab separated no header
+    write_output(
+        merged_df[['gene_set', 'chr', 'pos', 'snp']],
+        os.path.join(outdir, os.path.basename(filename.replace("_test", "_genesets"))),
+        format=format
+    )
+    return merged_df
+
+def dedup_setlist(setlist_df):
+    """
+    Deduplicates a setlist DataFrame by combining multiple occurrences of the same set.
+
+    Args:
+        setlist_df (pd.DataFrame): DataFrame containing the setlist.
+
+    Returns:
+        pd.DataFrame: Deduplicated setlist DataFrame.
+    """
+    # factorize gene sets and flatten the snp lists, then one C-level
+    # lexsort + unique pass dedups and sorts the snps of every group at
+    # once, instead of a Python set constructor per gene set
+    snp_lists = setlist_df['snp'].str.split(',')
+    lengths = np.fromiter((len(s) for s in snp_lists), dtype=np.int64, count=len(snp_lists))
+    keys, gene_sets = pd.factorize(setlist_df['gene_set'], sort=True)
+    rep_keys = np.repeat(keys, lengths)
+    flat_snps = np.concatenate(snp_lists.to_numpy())
+
+    order = np.lexsort((flat_snps, rep_keys))
+    sorted_keys = rep_keys[order]
+    sorted_snps = flat_snps[order]
+    # drop duplicate (gene_set, snp) pairs
+    keep = np.ones(len(sorted_keys), dtype=bool)
+    keep[1:] = (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_snps[1:] != sorted_snps[:-1])
+    sorted_keys = sorted_keys[keep]
+    sorted_snps = sorted_snps[keep]
+    # group boundaries are where the key changes
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    ends = np.r_[starts[1:], len(sorted_keys)]
+
+    # pos/chr keep the first occurrence per gene set, as before
+    _, first_rows = np.unique(keys, return_index=True)
+    return pd.DataFrame({
+        'gene_set': gene_sets[sorted_keys[starts]],
+        'snp': [','.join(sorted_snps[start:end]) for start, end in zip(starts, ends)],
+        'pos': setlist_df['pos'].to_numpy()[first_rows],
+        'chr': setlist_df['chr'].to_numpy()[first_rows],
+    })
+
+def convert_annot(filename, transcript_map, outdir='data/converted_annotations', format='tsv'):
+    """
+    Converts an annotation file to a DataFrame with gene sets.
+
+    Args:
+        filename (str): Path to the annotation file.
+        transcript_map (pd.DataFrame): DataFrame containing transcript to gene mapping.
+
+    Returns:
+        pd.DataFrame: DataFrame with gene sets and annotations.
+    """
+    annot_df = read_regenie_annotation(filename)
+    # align category codes with the transcript map so the merge stays on int codes
+    if isinstance(transcript_map['transcript'].dtype, pd.CategoricalDtype):
+        annot_df['transcript'] = annot_df['transcript'].astype(transcript_map['transcript'].dtype)
+    # merge with transcript map
+    merged_df = annot_df.merge(transcript_map, on='transcript', how='inner')
+    assert not merged_df['gene_set'].isna().any(), f"NaNs found in gene_set column for {filename}."
+
+    # save to file in snp, gene_set, snp_set order of columns, tab seperated no header
+    write_output(
+        merged_df[['snp', 'gene_set', 'snp_set']],
+        os.path.join(outdir, os.path.basename(filename.replace("_test", "_genesets"))),
+        format=format
+    )
+    return merged_df
+
+def _convert_chromosome(chrom, transcript_map, out_dir, format='tsv'):
+    """
+    Converts one chromosome's setlist, annotation and mask files.
+
+    Args:
+        chrom (str): Chromosome name, e.g. 'chr1'.
+        transcript_map (pd.DataFrame): Transcript-to-gene-set map slice for this chromosome.
+        out_dir (str): Output directory for the converted files.
+        format (str): Output format passed through to write_output.
+
+    Returns:
+        tuple: (setlist DataFrame or None, annotation DataFrame or None).
+    """
+    print(f"Processing chromosome: {chrom}")
+    setlist_df = None
+    annot_df = None
+
+    # read the setlist file for the chromosome
+    setlist_file = f'data/PTV_test/PTV_test.{chrom}.REGENIE.setListFile.txt'
+    if os.path.exists(setlist_file):
+        setlist_df = convert_setlist(setlist_file, transcript_map, outdir=out_dir, format=format)
+    else:
+        print(f"Setlist file for {chrom} does not exist: {setlist_file}")
+
+    annot_file = f'data/PTV_test/PTV_test.{chrom}.REGENIE.annotationFile.txt'
+    if os.path.exists(annot_file):
+        annot_df = convert_annot(annot_file, transcript_map, outdir=out_dir, format=format)
+    else:
+        print(f"Annotation file for {chrom} does not exist: {annot_file}")
+
+    # copy the maskfiles, and rename
+    mask_file = f'data/PTV_test/PTV_test.{chrom}.REGENIE.maskfile.txt'
+    if os.path.exists(mask_file):
+        out_name = f'PTV_genesets.{chrom}.REGENIE.maskfile.txt'
+        shutil.copy(mask_file, os.path.join(out_dir, out_name))
+    else:
+        print(f"Mask file for {chrom} does not exist: {mask_file}")
+
+    return setlist_df, annot_df
+
+def convert_data(out_dir='data/PTV_genesets', format='tsv'):
+    # load the gene set
+    geneset_df = read_gene_sets('data/burden_test_modules_exp2.obj')
+    # load transcript to gene map
+    transcript_to_gene = pd.read_csv('data/transcript_gene_map.csv')
+    transcript_to_gene.columns = ['chrom', 'transcript', 'gene', 'gene_symbol']
+    # cast key columns to category once, with a shared gene dtype so the
+    # merge joins on aligned int codes; the 22 per-chromosome merges then
+    # reuse the same category dictionaries
+    gene_dtype = pd.CategoricalDtype(
+        pd.Index(transcript_to_gene['gene'].unique()).union(geneset_df['gene'].unique())
+    )
+    transcript_to_gene['gene'] = transcript_to_gene['gene'].astype(gene_dtype)
+    geneset_df['gene'] = geneset_df['gene'].astype(gene_dtype)
+    transcript_to_gene['transcript'] = transcript_to_gene['transcript'].astype('category')
+    transcript_to_gene['gene_symbol'] = transcript_to_gene['gene_symbol'].astype('category')
+    transcript_to_gene['chrom'] = transcript_to_gene['chrom'].astype('category')
+    # merge the gene set with the transcript to gene map
+    merged_df = transcript_to_gene.merge(geneset_df, on='gene', how='inner')
+    # partition the transcript map by chromosome once, so each per-chromosome
+    # merge only builds a hash table over that chromosome's transcripts
+    chrom_maps = dict(tuple(merged_df.groupby('chrom', sort=False, observed=True)))
+    empty_map = merged_df.iloc[0:0]
+
+    # chromosomes are independent (distinct input and output files), so
+    # farm them out to a process pool; each worker only receives its own
+    # chromosome's slice of the transcript map
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(_convert_chromosome, chrom, chrom_maps.get(chrom, empty_map), out_dir, format)
+            for chrom in get_chromosomes()
+        ]
+        results = [future.result() for future in futures]
+
+    # combine the per-chromosome results in chromosome order
+    setlist_dfs = [setlist_df for setlist_df, _ in results if setlist_df is not None]
+    annot_dfs = [annot_df for _, annot_df in results if annot_df is not None]
+    combined_setlist = pd.concat(setlist_dfs, ignore_index=True) if setlist_dfs else pd.DataFrame()
+    combined_annotations = pd.concat(annot_dfs, ignore_index=True) if annot_dfs else pd.DataFrame()
+
+    combined_setlist = dedup_setlist(combined_setlist)
+
+    # save combined setlist and annotations
+    write_output(
+        combined_setlist[['gene_set', 'chr', 'pos', 'snp']],
+        os.path.join(out_dir, 'PTV_genesets_ext2.allchr.REGENIE.setListFile.txt'),
+        format=format
+    )
+    write_output(
+        combined_annotations[['snp', 'gene_set', 'snp_set']],
+        os.path.join(out_dir, 'PTV_genesets_ext2.allchr.REGENIE.annotationFile.txt'),
+        format=format
+    )
+
+    print("Conversion completed for all chromosomes.")
@@ -1,16 +1,154 @@
+import numpy as np
 import pandas as pd
-import swifter
-from typing import List, Dict, Set
+from typing import List, Tuple
 
 
-def create_trait_modules(trait_df: pd.DataFrame, 
-                        individual_df: pd.DataFrame, 
+def _normalize_code_lists(codes: pd.Series) -> pd.Series:
+    """Parse string representations like "[I48, I489]" into lists of codes."""
+    # only run the string pipeline on the string-typed subset, so
+    # list-valued entries in a mixed column pass through untouched
+    mask = codes.map(type).eq(str)
+    if mask.any():
+        parsed = codes[mask].str.strip('[]').str.replace(' ', '', regex=False).str.split(',')
+        codes = codes.where(~mask, parsed)
+    return codes
+
+
+def _build_code_trait_csr(map_df: pd.DataFrame,
+                          trait_index_col: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build a CSR-style (code -> trait ids) lookup from the exploded map.
+
+    Returns three aligned arrays: the sorted unique codes, the offsets of
+    each code's run, and the flat trait ids, so that the traits for
+    sorted_codes[i] are trait_flat[offsets[i]:offsets[i + 1]].
+    """
+    map_df = map_df.sort_values('code', kind='stable')
+    codes = map_df['code'].to_numpy()
+    sorted_codes, starts = np.unique(codes, return_index=True)
+    offsets = np.append(starts, len(codes))
+    trait_flat = map_df[trait_index_col].to_numpy(dtype=np.int32)
+    return sorted_codes, offsets, trait_flat
+
+
+def _lookup_trait_modules(individual_codes,
+                          sorted_codes: np.ndarray,
+                          offsets: np.ndarray,
+                          trait_flat: np.ndarray) -> List[int]:
+    """Look up the trait ids for one individual's codes via binary search."""
+    if not isinstance(individual_codes, list) or len(individual_codes) == 0:
+        return []
+    codes = np.array([c.strip().strip("'\"") for c in individual_codes])
+    pos = np.searchsorted(sorted_codes, codes)
+    valid = pos < len(sorted_codes)
+    valid[valid] = sorted_codes[pos[valid]] == codes[valid]
+    pos = pos[valid]
+    if len(pos) == 0:
+        return []
+    traits = np.concatenate([trait_flat[offsets[i]:offsets[i + 1]] for i in pos])
+    return np.unique(traits).tolist()
+
+
+_union_traits_kernel = None
+
+
+def _get_union_traits_kernel():
+    """Compile (once) the numba kernel that unions trait ids per individual."""
+    global _union_traits_kernel
+    if _union_traits_kernel is None:
+        from numba import njit, prange
+
+        @njit(parallel=True)
+        def kernel(ind_offsets, ind_codes, code_offsets, trait_dense, n_traits):
+            n_individuals = len(ind_offsets) - 1
+            counts = np.zeros(n_individuals, dtype=np.int64)
+            for i in prange(n_individuals):
+                seen = np.zeros(n_traits, dtype=np.bool_)
+                count = 0
+                for j in range(ind_offsets[i], ind_offsets[i + 1]):
+                    code = ind_codes[j]
+                    if code < 0:
+                        continue
+                    for k in range(code_offsets[code], code_offsets[code + 1]):
+                        trait = trait_dense[k]
+                        if not seen[trait]:
+                            seen[trait] = True
+                            count += 1
+                counts[i] = count
+            out_offsets = np.zeros(n_individuals + 1, dtype=np.int64)
+            out_offsets[1:] = np.cumsum(counts)
+            out_flat = np.empty(out_offsets[-1], dtype=np.int32)
+            for i in prange(n_individuals):
+                seen = np.zeros(n_traits, dtype=np.bool_)
+                for j in range(ind_offsets[i], ind_offsets[i + 1]):
+                    code = ind_codes[j]
+                    if code < 0:
+                        continue
+                    for k in range(code_offsets[code], code_offsets[code + 1]):
+                        seen[trait_dense[k]] = True
+                pos = out_offsets[i]
+                # emit in dense-id order, i.e. sorted trait ids
+                for trait in range(n_traits):
+                    if seen[trait]:
+                        out_flat[pos] = trait
+                        pos += 1
+            return out_offsets, out_flat
+
+        _union_traits_kernel = kernel
+    return _union_traits_kernel
+
+
+def _union_traits_numba(individual_codes: pd.Series,
+                        map_df: pd.DataFrame,
+                        trait_index_col: str) -> List[List[int]]:
+    """
+    Union trait ids per individual with the compiled CSR kernel.
+
+    Codes and trait ids are factorized to dense int32, individuals'
+    code lists are flattened into one CSR layout, and the numba kernel
+    runs the per-individual union in parallel native code.
+    """
+    map_sorted = map_df.sort_values('code', kind='stable')
+    code_values, code_starts = np.unique(map_sorted['code'].to_numpy(), return_index=True)
+    code_offsets = np.append(code_starts, len(map_sorted)).astype(np.int64)
+    trait_values = np.unique(map_df[trait_index_col].to_numpy())
+    trait_dense = np.searchsorted(trait_values, map_sorted[trait_index_col].to_numpy()).astype(np.int32)
+
+    code_lists = [
+        [c.strip().strip("'\"") for c in codes] if isinstance(codes, list) else []
+        for codes in individual_codes
+    ]
+    lengths = np.fromiter((len(codes) for codes in code_lists), dtype=np.int64, count=len(code_lists))
+    ind_offsets = np.zeros(len(code_lists) + 1, dtype=np.int64)
+    ind_offsets[1:] = np.cumsum(lengths)
+
+    flat = [code for codes in code_lists for code in codes]
+    if flat:
+        flat = np.array(flat)
+        pos = np.searchsorted(code_values, flat)
+        valid = pos < len(code_values)
+        valid[valid] = code_values[pos[valid]] == flat[valid]
+        ind_codes = np.where(valid, pos, -1).astype(np.int32)
+    else:
+        ind_codes = np.empty(0, dtype=np.int32)
+
+    kernel = _get_union_traits_kernel()
+    out_offsets, out_flat = kernel(ind_offsets, ind_codes, code_offsets, trait_dense, len(trait_values))
+    return [
+        trait_values[out_flat[out_offsets[i]:out_offsets[i + 1]]].tolist()
+        for i in range(len(code_lists))
+    ]
+
+
+def create_trait_modules(trait_df: pd.DataFrame,
+                        individual_df: pd.DataFrame,
                         icd10_column: str = 'icd10_codes',
                         trait_index_col: str = 'idx',
-                        trait_codes_col: str = 'icd10') -> pd.DataFrame:
+                        trait_codes_col: str = 'icd10',
+                        method: str = 'merge') -> pd.DataFrame:
     """
     Create trait modules for individuals based on their ICD10 codes.
-    
+
     Parameters:
     -----------
     trait_df : pd.DataFrame
@@ -26,67 +164,72 @@ def create_trait_modules(trait_df: pd.DataFrame,
         Name of column in trait_df containing trait identifiers
     trait_codes_col : str
         Name of column in trait_df containing ICD10 code lists
-        
+    method : str
+        'merge' (default) resolves all individuals at once via a
+        relational join; 'numpy' looks codes up per individual against a
+        CSR-style sorted-array index, useful for debugging single rows;
+        'numba' runs the per-individual union as a compiled parallel
+        kernel over int-encoded codes (requires numba)
+
     Returns:
     --------
     pd.DataFrame
         Original individual_df with added 'trait_modules' column containing
         list of trait indices for each individual
     """
-    
-    # Create a copy to avoid modifying original
-    result_df = individual_df.copy()
-    
-    # Create mapping from ICD10 code to trait indices
-    icd10_to_traits: Dict[str, List[int]] = {}
-    
-    for _, row in trait_df.iterrows():
-        trait_idx = row[trait_index_col]
-        icd10_codes = row[trait_codes_col]
-        
-        # Handle case where icd10_codes might be a string representation of list
-        if isinstance(icd10_codes, str):
-            # Parse string like "[I48, I489, I482]" to list
-            icd10_codes = icd10_codes.strip('[]').replace(' ', '').split(',')
-        
-        # Add this trait to each ICD10 code's mapping
-        for code in icd10_codes:
-            code = code.strip().strip("'\"")  # Remove quotes and whitespace
-            if code not in icd10_to_traits:
-                icd10_to_traits[code] = []
-            icd10_to_traits[code].append(trait_idx)
-    
-    def get_trait_modules(individual_codes) -> List[int]:
-        """Get trait modules for an individual's ICD10 codes."""
-        if individual_codes is None or (isinstance(individual_codes, float) and pd.isna(individual_codes)):
-            return []
-        
-        # Handle different input formats
-        if isinstance(individual_codes, str):
-            # Parse string representation if needed
-            if individual_codes.startswith('['):
-                codes = individual_codes.strip('[]').replace(' ', '').split(',')
-                codes = [c.strip().strip("'\"") for c in codes if c.strip()]
-            else:
-                # Assume comma-separated or single code
-                codes = [c.strip() for c in individual_codes.split(',')]
-        elif isinstance(individual_codes, list):
-            codes = individual_codes
-        else:
-            return []
-        
-        # Find all trait modules for this individual
-        trait_modules: Set[int] = set()
-        for code in codes:
-            if code in icd10_to_traits:
-                trait_modules.update(icd10_to_traits[code])
-        
-        return sorted(list(trait_modules))
-    
-    # Apply function to create trait modules for each individual
-    result_df['trait_modules'] = result_df[icd10_column].swifter.apply(get_trait_modules)
-    
-    return result_df
+
+    # Create mapping from ICD10 code to trait indices via a vectorized
+    # explode pipeline instead of a per-row Python loop
+    codes = _normalize_code_lists(trait_df[trait_codes_col])
+    map_df = trait_df[[trait_index_col]].assign(code=codes).explode('code')
+    # Remove quotes and whitespace from individual codes
+    map_df['code'] = map_df['code'].str.strip().str.strip("'\"")
+
+    individual_codes = _normalize_code_lists(individual_df[icd10_column])
+
+    if method == 'numba':
+        modules = _union_traits_numba(individual_codes, map_df, trait_index_col)
+        return individual_df.assign(
+            trait_modules=pd.Series(modules, index=individual_df.index)
+        )
+
+    if method == 'numpy':
+        # CSR lookup: batched searchsorted + gather per individual instead
+        # of per-code dict probes
+        sorted_codes, offsets, trait_flat = _build_code_trait_csr(map_df, trait_index_col)
+        modules = [
+            _lookup_trait_modules(codes, sorted_codes, offsets, trait_flat)
+            for codes in individual_codes
+        ]
+        # assign materializes only the new column instead of copying the frame
+        return individual_df.assign(
+            trait_modules=pd.Series(modules, index=individual_df.index)
+        )
+
+    # Reformulate the per-individual lookup as a relational join: explode
+    # individuals' codes, inner-merge with the (code -> trait) table and
+    # group back by individual
+    codes_df = pd.DataFrame({
+        '_row': range(len(individual_codes)),
+        'code': individual_codes.to_numpy(),
+    }).explode('code')
+    # drop NaNs from empty/missing code lists before stripping: on an
+    # all-NaN column the .str accessor would raise instead of no-op
+    codes_df = codes_df.dropna(subset=['code'])
+    if len(codes_df):
+        codes_df['code'] = codes_df['code'].str.strip().str.strip("'\"")
+
+    merged = codes_df.merge(map_df, on='code', how='inner', validate='m:m')
+    modules = merged.groupby('_row')[trait_index_col].apply(lambda s: sorted(set(s)))
+    # Individuals without any matching code get an empty list
+    trait_modules: List[List[int]] = [
+        m if isinstance(m, list) else []
+        for m in modules.reindex(range(len(individual_df)))
+    ]
+    # assign materializes only the new column instead of copying the frame
+    return individual_df.assign(
+        trait_modules=pd.Series(trait_modules, index=individual_df.index)
+    )
 
 
 # Example usage:
@@ -94,7 +237,7 @@ if __name__ == "__main__":
     # Example trait definitions (like your data)
 
     trait_df = pd.read_pickle("data/burden_test_trait_info.obj")
-    
+
     # Example individual data
     individual_data = {
         'id': [1, 2, 3, 4, 5],
@@ -107,7 +250,7 @@ if __name__ == "__main__":
         ]
     }
     individual_df = pd.DataFrame(individual_data)
-    
+
     # Create trait modules
     result = create_trait_modules(trait_df.reset_index(), individual_df)
     print(result)